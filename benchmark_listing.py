@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark y comparación de recall de la extracción de listados
+
+Compara el método anterior (contenedores <article>/<div> con find_all anidados)
+con el recorrido único de enlaces de src.listing sobre páginas de sección guardadas.
+
+Uso:
+    python benchmark_listing.py --save https://theobjective.com/economia/ benchmark_pages/economia.html
+    python benchmark_listing.py benchmark_pages/*.html
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from src.listing import canonical_link, extract_article_links
+from src.scraper import DittoScraper
+
+
+def legacy_extract(content: bytes, page_url: str) -> list:
+    """Método de extracción de listados anterior, conservado como referencia"""
+    soup = BeautifulSoup(content, 'html.parser')
+    articles = []
+    potential_articles = soup.find_all(['article', 'div'], class_=lambda x: x and any(
+        keyword in x.lower() for keyword in ['article', 'post', 'news', 'story', 'content']
+    ))
+    for article_elem in potential_articles:
+        article_data = {}
+        title_elem = article_elem.find(['h1', 'h2', 'h3', 'h4'], class_=lambda x: x and any(
+            keyword in x.lower() for keyword in ['title', 'heading', 'headline']
+        ))
+        if title_elem:
+            article_data['title'] = title_elem.get_text(strip=True)
+        link_elem = article_elem.find('a', href=True)
+        if link_elem:
+            article_data['link'] = urljoin(page_url, link_elem['href'])
+        if article_data.get('title') or article_data.get('link'):
+            articles.append(article_data)
+    return articles
+
+
+def _time(func, repeat: int) -> float:
+    """Mediana en milisegundos de varias ejecuciones"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+# Prefijos de páginas que no son artículos (autores, etiquetas, paginación...)
+NON_ARTICLE_PREFIXES = ('/autor/', '/author/', '/tag/', '/etiqueta/', '/page/', '/buscar/', '/newsletter/')
+
+
+def _navigation_links(soup: BeautifulSoup, page_url: str) -> set:
+    """Enlaces del menú, cabecera y pie: secciones y páginas fijas del sitio"""
+    links = set()
+    for container in soup.find_all(['nav', 'header', 'footer']):
+        for a in container.find_all('a', href=True):
+            links.add(canonical_link(urljoin(page_url, a['href'])))
+    return links
+
+
+def legacy_article_links(legacy: list, soup: BeautifulSoup, page_url: str, profile) -> set:
+    """
+    Enlaces a artículos del método anterior, sin depender de article_url_pattern
+
+    Se descartan enlaces a otros dominios, la portada y secciones de un solo nivel,
+    los enlaces de navegación y las páginas de autor, etiqueta o paginación.
+    """
+    navigation = _navigation_links(soup, page_url)
+    links = set()
+    for item in legacy:
+        if not item.get('link'):
+            continue
+        link = canonical_link(item['link'])
+        parsed = urlparse(link)
+        if not profile.matches(parsed.netloc):
+            continue
+        segments = [segment for segment in parsed.path.split('/') if segment]
+        if len(segments) < 2 or link in navigation or parsed.path.startswith(NON_ARTICLE_PREFIXES):
+            continue
+        links.add(link)
+    return links
+
+
+def compare(path: str, page_url: str, profile, repeat: int) -> dict:
+    """Compara ambos métodos sobre una página guardada"""
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    legacy = legacy_extract(content, page_url)
+    fast = extract_article_links(content, page_url, profile)
+
+    # El método anterior devuelve también enlaces que no son artículos y repetidos
+    legacy_links = legacy_article_links(legacy, BeautifulSoup(content, 'html.parser'), page_url, profile)
+    fast_links = {item['link'] for item in fast}
+    recall = len(legacy_links & fast_links) / len(legacy_links) if legacy_links else 1.0
+
+    return {
+        'path': path,
+        'legacy_items': len(legacy),
+        'legacy_articles': len(legacy_links),
+        'fast_articles': len(fast_links),
+        'fast_with_title': sum(1 for item in fast if item['title']),
+        'recall': recall,
+        'missed': sorted(legacy_links - fast_links),
+        'legacy_ms': _time(lambda: legacy_extract(content, page_url), repeat),
+        'fast_ms': _time(lambda: extract_article_links(content, page_url, profile), repeat),
+    }
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de extracción de listados")
+    parser.add_argument('pages', nargs='*', help="Páginas de sección guardadas en HTML")
+    parser.add_argument('--save', nargs=2, metavar=('URL', 'FICHERO'), help="Descarga y guarda una página de sección")
+    parser.add_argument('--page-url', default=None, help="URL original de las páginas (para enlaces relativos)")
+    parser.add_argument('--repeat', type=int, default=20, help="Repeticiones por medición")
+    args = parser.parse_args()
+
+    scraper = DittoScraper()
+
+    if args.save:
+        url, output = args.save
+        content, _ = scraper._download(url)
+        with open(output, 'wb') as f:
+            f.write(content)
+        print(f"💾 Página guardada en {output}")
+
+    if not args.pages:
+        if not args.save:
+            parser.print_help()
+            sys.exit(1)
+        return
+
+    page_url = args.page_url or scraper.base_url
+    profile = scraper._get_profile(page_url)
+
+    print(f"{'Página':40} {'Anterior':>9} {'Artículos':>9} {'Nuevo':>6} {'Títulos':>8} {'Recall':>7} {'Ant. ms':>8} {'Nuevo ms':>9} {'x':>6}")
+    for path in args.pages:
+        result = compare(path, page_url, profile, args.repeat)
+        speedup = result['legacy_ms'] / result['fast_ms'] if result['fast_ms'] else float('inf')
+        print(f"{result['path'][-40:]:40} {result['legacy_items']:>9} {result['legacy_articles']:>9} "
+              f"{result['fast_articles']:>6} {result['fast_with_title']:>8} {result['recall']:>7.1%} "
+              f"{result['legacy_ms']:>8.1f} {result['fast_ms']:>9.1f} {speedup:>6.1f}")
+        for link in result['missed']:
+            print(f"  ✗ no detectado: {link}")
+
+
+if __name__ == "__main__":
+    main()
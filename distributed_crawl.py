@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Crawl distribuido con una cola de trabajo compartida
+
+Uso:
+    python distributed_crawl.py discover https://theobjective.com/economia/
+    python distributed_crawl.py worker
+    python distributed_crawl.py stats
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from src.scraper import DittoScraper
+from src.memory import MemoryProfiler, RecyclePolicy
+from src.work_queue import SQLiteWorkQueue, discover, run_worker
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Crawl distribuido de Ditto Scraper")
+    parser.add_argument('--queue', default='crawl_queue.db', help="Fichero SQLite de la cola compartida")
+    parser.add_argument('--max-attempts', type=int, default=3, help="Intentos máximos por URL")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    discover_parser = subparsers.add_parser('discover', help="Encola los artículos de páginas de listado")
+    discover_parser.add_argument('urls', nargs='*', help="Páginas de listado (por defecto la principal)")
+
+    worker_parser = subparsers.add_parser('worker', help="Procesa URLs de la cola")
+    worker_parser.add_argument('--worker-id', default=None, help="Identificador del worker")
+    worker_parser.add_argument('--lease', type=float, default=300, help="Segundos de reserva por URL")
+    worker_parser.add_argument('--idle-timeout', type=float, default=0,
+                               help="Segundos a esperar trabajo nuevo antes de terminar")
+    worker_parser.add_argument('--max-pages', type=int, default=0,
+                               help="Reiniciar el worker tras este número de páginas")
+    worker_parser.add_argument('--max-rss-mb', type=float, default=0,
+                               help="Reiniciar el worker al superar esta memoria residente")
+    worker_parser.add_argument('--gc-every', type=int, default=20,
+                               help="Forzar la recolección de basura cada N artículos (0 la desactiva)")
+    worker_parser.add_argument('--memory-report', default=None,
+                               help="Activa el perfilado de memoria y guarda el informe en este fichero")
+
+    subparsers.add_parser('stats', help="Muestra el estado de la cola")
+
+    export_parser = subparsers.add_parser('export', help="Exporta los resultados a JSON o Parquet")
+    export_parser.add_argument('output', help="Fichero JSON o directorio del dataset Parquet")
+    export_parser.add_argument('--format', choices=['json', 'parquet'], default='json',
+                               help="Formato de exportación")
+    export_parser.add_argument('--row-group-size', type=int, default=10_000,
+                               help="Artículos por row group en Parquet")
+
+    args = parser.parse_args()
+    queue = SQLiteWorkQueue(args.queue, max_attempts=args.max_attempts)
+
+    try:
+        if args.command == 'discover':
+            scraper = DittoScraper()
+            total = sum(discover(scraper, queue, url) for url in (args.urls or [None]))
+            print(f"📥 URLs nuevas encoladas: {total}")
+        elif args.command == 'worker':
+            profiler = MemoryProfiler() if args.memory_report else None
+            if profiler:
+                profiler.start()
+            recycle = RecyclePolicy(max_pages=args.max_pages, max_rss_mb=args.max_rss_mb)
+            scraper = DittoScraper(profiler=profiler, gc_every=args.gc_every)
+            processed = run_worker(scraper, queue, worker_id=args.worker_id,
+                                   lease_seconds=args.lease, idle_timeout=args.idle_timeout,
+                                   recycle=recycle)
+            print(f"✅ Artículos procesados: {processed}")
+            if profiler:
+                profiler.stop()
+                with open(args.memory_report, 'a', encoding='utf-8') as f:
+                    f.write(profiler.report() + '\n\n')
+                print(f"🧠 Informe de memoria guardado en {args.memory_report}")
+            if recycle.reason:
+                # Reemplazar el proceso por uno nuevo para partir de memoria limpia
+                queue.close()
+                print(f"♻️ Reiniciando worker ({recycle.reason})")
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+        elif args.command == 'stats':
+            for status, count in queue.stats().items():
+                print(f"{status}: {count}")
+        elif args.command == 'export' and args.format == 'parquet':
+            from src.exporter import export_parquet
+            written = export_parquet(queue.iter_results(), args.output, row_group_size=args.row_group_size)
+            print(f"💾 {written} artículos exportados a {args.output}")
+        elif args.command == 'export':
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(queue.results(), f, ensure_ascii=False, indent=2)
+            print(f"💾 Resultados exportados a {args.output}")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
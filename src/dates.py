@@ -0,0 +1,183 @@
+"""
+Normalización de fechas de publicación a datetimes con zona horaria
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+# Zona horaria usada cuando la fecha no indica ninguna
+DEFAULT_TIMEZONE = ZoneInfo('Europe/Madrid')
+
+SPANISH_MONTHS = {
+    'enero': 1, 'ene': 1,
+    'febrero': 2, 'feb': 2,
+    'marzo': 3, 'mar': 3,
+    'abril': 4, 'abr': 4,
+    'mayo': 5, 'may': 5,
+    'junio': 6, 'jun': 6,
+    'julio': 7, 'jul': 7,
+    'agosto': 8, 'ago': 8,
+    'septiembre': 9, 'setiembre': 9, 'sept': 9, 'sep': 9,
+    'octubre': 10, 'oct': 10,
+    'noviembre': 11, 'nov': 11,
+    'diciembre': 12, 'dic': 12,
+}
+
+RELATIVE_UNITS = {
+    'minuto': 'minutes', 'hora': 'hours', 'día': 'days', 'dia': 'days', 'semana': 'weeks',
+}
+
+# Los nombres largos primero para que 'sept' no se quede en 'sep'
+_MONTH_ALTERNATION = '|'.join(sorted(SPANISH_MONTHS, key=len, reverse=True))
+_MONTH_RE = re.compile(rf'\b(?:{_MONTH_ALTERNATION})\b')
+_DIGIT_RE = re.compile(r'\d')
+
+# Segmento /YYYY-MM-DD/ presente en las URLs de los artículos
+URL_DATE_RE = re.compile(r'/(\d{4})-(\d{2})-(\d{2})/')
+
+_ISO_RE = re.compile(
+    r'^\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:z|[+-]\d{2}:?\d{2})?$'
+)
+_SPANISH_RE = re.compile(
+    rf'(\d{{1,2}})\s+(?:de\s+)?({_MONTH_ALTERNATION})\.?,?\s+(?:de\s+)?(\d{{4}})'
+    r'(?:\D{1,10}?(\d{1,2}):(\d{2}))?'
+)
+_NUMERIC_RE = re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})(?:\D{1,10}?(\d{1,2}):(\d{2}))?')
+_RELATIVE_RE = re.compile(r'hace\s+(\d+|un|una)\s+(minuto|hora|día|dia|semana)s?')
+_DAY_WORD_RE = re.compile(r'\b(anteayer|ayer|hoy)\b')
+_TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+
+
+def _localize(value: datetime, tz) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=tz)
+
+
+class DateNormalizer:
+    """
+    Convierte fechas en texto libre a datetimes con zona horaria
+
+    El formato detectado se memoriza por la "forma" del texto (dígitos y nombres de
+    mes sustituidos por comodines), de modo que las fechas con un formato ya visto
+    se parsean con un único patrón sin volver a probar todos.
+    """
+
+    def __init__(self, tz=DEFAULT_TIMEZONE, cache_size: int = 1024):
+        self.tz = tz
+        self.cache_size = cache_size
+        self._format_cache = {}
+        self._parsers = (
+            (_ISO_RE, self._parse_iso),
+            (_SPANISH_RE, self._parse_spanish),
+            (_NUMERIC_RE, self._parse_numeric),
+            (_RELATIVE_RE, self._parse_relative),
+            (_DAY_WORD_RE, self._parse_day_word),
+        )
+
+    @staticmethod
+    def _shape(text: str) -> str:
+        """Forma del texto: dígitos como '9' y meses como 'M'"""
+        return _MONTH_RE.sub('M', _DIGIT_RE.sub('9', text))
+
+    def from_url(self, url: str) -> Optional[datetime]:
+        """Obtiene la fecha del segmento /YYYY-MM-DD/ de la URL sin parsear texto"""
+        match = URL_DATE_RE.search(url or '')
+        if not match:
+            return None
+        year, month, day = (int(part) for part in match.groups())
+        try:
+            return datetime(year, month, day, tzinfo=self.tz)
+        except ValueError:
+            return None
+
+    def parse(self, text: str, now: datetime = None) -> Optional[datetime]:
+        """
+        Parsea una fecha en texto libre
+
+        Args:
+            text: Fecha en formato ISO, numérico, en español o relativa ("hace 3 horas")
+            now: Momento de referencia para las fechas relativas
+
+        Returns:
+            Datetime con zona horaria o None si no se reconoce el formato
+        """
+        if not text:
+            return None
+        text = text.strip().lower()
+        shape = self._shape(text)
+
+        if shape in self._format_cache:
+            candidates = self._format_cache[shape]
+            if candidates is None:
+                return None
+            candidates = (candidates,)
+        else:
+            candidates = self._parsers
+
+        matched = False
+        for pattern, parser in candidates:
+            match = pattern.search(text)
+            if not match:
+                continue
+            matched = True
+            try:
+                value = parser(match, text, now)
+            except ValueError:
+                # Formato reconocido pero valores imposibles (p. ej. 31/02)
+                continue
+            self._remember(shape, (pattern, parser))
+            return value
+
+        if not matched:
+            self._remember(shape, None)
+        return None
+
+    def normalize(self, text: str, url: str = None, now: datetime = None) -> Optional[datetime]:
+        """
+        Obtiene la fecha de publicación a partir del texto extraído y la URL
+
+        Si el texto incluye una hora (o es relativo) se parsea para no perderla. Si solo
+        contiene la fecha, la URL con segmento /YYYY-MM-DD/ da el mismo día sin parsear
+        el texto. La URL también se usa cuando el texto no se reconoce.
+        """
+        lowered = (text or '').lower()
+        if not (_TIME_RE.search(lowered) or _RELATIVE_RE.search(lowered)):
+            value = self.from_url(url)
+            if value:
+                return value
+        return self.parse(text, now) or self.from_url(url)
+
+    def _remember(self, shape: str, entry):
+        if len(self._format_cache) >= self.cache_size:
+            self._format_cache.clear()
+        self._format_cache[shape] = entry
+
+    def _parse_iso(self, match, text, now):
+        value = text.upper().replace('Z', '+00:00')
+        # fromisoformat de Python < 3.11 no acepta offsets sin ':'
+        value = re.sub(r'([+-]\d{2})(\d{2})$', r'\1:\2', value)
+        # Convertir a la zona local para que el día de publicación sea coherente
+        return _localize(datetime.fromisoformat(value), self.tz).astimezone(self.tz)
+
+    def _parse_spanish(self, match, text, now):
+        day, month, year, hour, minute = match.groups()
+        return datetime(int(year), SPANISH_MONTHS[month], int(day),
+                        int(hour or 0), int(minute or 0), tzinfo=self.tz)
+
+    def _parse_numeric(self, match, text, now):
+        day, month, year, hour, minute = match.groups()
+        return datetime(int(year), int(month), int(day),
+                        int(hour or 0), int(minute or 0), tzinfo=self.tz)
+
+    def _parse_relative(self, match, text, now):
+        amount, unit = match.groups()
+        amount = 1 if amount in ('un', 'una') else int(amount)
+        now = _localize(now or datetime.now(timezone.utc), self.tz).astimezone(self.tz)
+        return now - timedelta(**{RELATIVE_UNITS[unit]: amount})
+
+    def _parse_day_word(self, match, text, now):
+        days_ago = {'hoy': 0, 'ayer': 1, 'anteayer': 2}[match.group(1)]
+        now = _localize(now or datetime.now(timezone.utc), self.tz).astimezone(self.tz)
+        day = now - timedelta(days=days_ago)
+        return day.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,172 @@
+"""
+Exportación de artículos a Parquet particionado para análisis
+"""
+
+import logging
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Columnas de texto sin codificar
+STRING_COLUMNS = ('url', 'title', 'subtitle', 'date', 'content')
+
+# Columnas usadas para particionar el dataset en disco (directorios estilo Hive)
+PARTITION_COLUMNS = ['category', 'pub_date']
+
+# Esquema de los ficheros; las columnas de partición van en la ruta
+SCHEMA = pa.schema(
+    [(name, pa.string()) for name in STRING_COLUMNS] + [
+        ('published_at', pa.timestamp('us', tz='UTC')),
+        ('author', pa.dictionary(pa.int32(), pa.string())),
+        ('tags', pa.list_(pa.dictionary(pa.int32(), pa.string()))),
+        ('budget_violations', pa.list_(pa.string())),
+    ]
+)
+
+DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+
+def _publication_date(article: dict) -> str:
+    """Obtiene la fecha de publicación YYYY-MM-DD del artículo o de su URL"""
+    if article.get('published_at'):
+        return article['published_at'][:10]
+    for source in (article.get('date') or '', article.get('url') or ''):
+        match = DATE_PATTERN.search(source)
+        if match:
+            return match.group(1)
+    return 'unknown'
+
+
+class ParquetExporter:
+    """
+    Acumula artículos y los escribe como Parquet particionado por categoría y fecha
+
+    Cada partición tiene un único fichero abierto con su propio ParquetWriter. Los
+    artículos se acumulan por partición y se escriben como un row group al llegar a
+    row_group_size, de forma que la memoria usada no depende del número total de
+    artículos y cada partición acaba en pocos ficheros con row groups grandes.
+    """
+
+    def __init__(self, root_path: str, row_group_size: int = 10_000,
+                 max_buffered_rows: int = None, max_open_writers: int = 64):
+        """
+        Args:
+            root_path: Directorio raíz del dataset
+            row_group_size: Número de artículos por row group
+            max_buffered_rows: Artículos en memoria entre todas las particiones antes de
+                escribirlos. Si es None, cuatro veces row_group_size
+            max_open_writers: Ficheros abiertos a la vez; al superarlo se cierra el más antiguo
+        """
+        self.root_path = Path(root_path)
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max_buffered_rows or 4 * row_group_size
+        self.max_open_writers = max_open_writers
+        self._buffers = {}
+        self._buffered = 0
+        self._writers = {}
+        self.written = 0
+        self.files = 0
+
+    def add(self, article: dict):
+        """Añade un artículo al buffer de su partición, escribiendo a disco si se llena"""
+        key = (article.get('category') or 'unknown', _publication_date(article))
+        rows = self._buffers.setdefault(key, [])
+        rows.append(article)
+        self._buffered += 1
+        if len(rows) >= self.row_group_size:
+            self._write(key)
+        elif self._buffered >= self.max_buffered_rows:
+            self.flush()
+
+    def extend(self, articles):
+        for article in articles:
+            self.add(article)
+
+    def _to_table(self, rows: list) -> pa.Table:
+        """Convierte los artículos en una tabla Arrow con autores y tags codificados como diccionario"""
+        columns = {
+            name: pa.array([row.get(name) or '' for row in rows], type=pa.string())
+            for name in STRING_COLUMNS
+        }
+        columns['published_at'] = pa.array(
+            [datetime.fromisoformat(row['published_at']) if row.get('published_at') else None for row in rows],
+            type=pa.timestamp('us', tz='UTC')
+        )
+        columns['author'] = pa.array(
+            [row.get('author') or '' for row in rows], type=pa.string()
+        ).dictionary_encode()
+
+        tags = pa.array([row.get('tags') or [] for row in rows], type=pa.list_(pa.string()))
+        columns['tags'] = pa.ListArray.from_arrays(tags.offsets, tags.flatten().dictionary_encode())
+
+        columns['budget_violations'] = pa.array(
+            [row.get('budget_violations') or [] for row in rows], type=pa.list_(pa.string())
+        )
+        return pa.table(columns, schema=SCHEMA)
+
+    def _writer(self, key: tuple) -> pq.ParquetWriter:
+        """Devuelve el writer abierto de la partición, creando un fichero nuevo si no lo hay"""
+        writer = self._writers.pop(key, None)
+        if writer is None:
+            if len(self._writers) >= self.max_open_writers:
+                oldest = next(iter(self._writers))
+                self._writers.pop(oldest).close()
+            category, pub_date = key
+            directory = self.root_path / f"category={quote(category, safe='')}" / f"pub_date={pub_date}"
+            directory.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(
+                str(directory / f"part-{uuid.uuid4().hex}.parquet"), SCHEMA, compression='zstd'
+            )
+            self.files += 1
+        # Reinsertar al final para cerrar primero los menos usados
+        self._writers[key] = writer
+        return writer
+
+    def _write(self, key: tuple):
+        """Escribe el buffer de una partición como un row group"""
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        self._writer(key).write_table(self._to_table(rows), row_group_size=self.row_group_size)
+        self._buffered -= len(rows)
+        self.written += len(rows)
+
+    def flush(self):
+        """Escribe los artículos acumulados de todas las particiones"""
+        if not self._buffers:
+            return
+        for key in list(self._buffers):
+            self._write(key)
+        logger.info(f"Escritos {self.written} artículos en {self.root_path} ({self.files} ficheros)")
+
+    def close(self):
+        """Escribe lo pendiente y cierra todos los ficheros"""
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_parquet(articles, root_path: str, row_group_size: int = 10_000) -> int:
+    """
+    Exporta una secuencia de artículos a un dataset Parquet particionado
+
+    Returns:
+        Número de artículos escritos
+    """
+    with ParquetExporter(root_path, row_group_size=row_group_size) as exporter:
+        exporter.extend(articles)
+    return exporter.written
@@ -0,0 +1,79 @@
+"""
+Límites de recursos para la descarga y extracción de páginas
+"""
+
+import time
+
+
+class ResourceLimits:
+    """Límites de tiempo, tamaño y CPU aplicados a cada página"""
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 15.0,
+                 total_timeout: float = 30.0, max_response_bytes: int = 5 * 1024 * 1024,
+                 max_dom_nodes: int = 100_000, cpu_time_budget: float = 5.0):
+        """
+        Args:
+            connect_timeout: Segundos máximos para establecer la conexión
+            read_timeout: Segundos máximos entre bytes recibidos
+            total_timeout: Segundos máximos para descargar la respuesta completa
+            max_response_bytes: Tamaño máximo de la respuesta; el resto se descarta
+            max_dom_nodes: Número máximo de etiquetas que se llegan a parsear
+            cpu_time_budget: Segundos de CPU máximos para parsear y extraer un artículo
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.max_response_bytes = max_response_bytes
+        self.max_dom_nodes = max_dom_nodes
+        self.cpu_time_budget = cpu_time_budget
+
+    @property
+    def timeout(self) -> tuple:
+        """Timeout de conexión y lectura en el formato de requests"""
+        return (self.connect_timeout, self.read_timeout)
+
+
+class BudgetExceeded(Exception):
+    """Se ha agotado el presupuesto de CPU de una extracción"""
+
+
+class CpuBudget:
+    """
+    Controla el tiempo de CPU consumido por una extracción
+
+    Se mide la CPU del hilo actual y no la del proceso, para no contar otros
+    hilos (descargas, otras sesiones de Streamlit) que corren a la vez.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.start = time.thread_time()
+
+    @property
+    def elapsed(self) -> float:
+        return time.thread_time() - self.start
+
+    def check(self, stage: str):
+        """
+        Raises:
+            BudgetExceeded: Si se ha superado el presupuesto al terminar la etapa
+        """
+        if self.seconds and self.elapsed > self.seconds:
+            raise BudgetExceeded(stage)
+
+
+def truncate_markup(content: bytes, max_nodes: int) -> tuple:
+    """
+    Recorta el HTML para que no contenga más de max_nodes etiquetas
+
+    Returns:
+        Tupla (contenido, recortado)
+    """
+    # Contar '<' es una cota superior barata del número de nodos
+    if not max_nodes or content.count(b'<') <= max_nodes:
+        return content, False
+
+    position = -1
+    for _ in range(max_nodes + 1):
+        position = content.find(b'<', position + 1)
+    return content[:position], True
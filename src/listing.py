@@ -0,0 +1,132 @@
+"""
+Extracción rápida de enlaces a artículos en páginas de listado
+"""
+
+import re
+from urllib.parse import urljoin, urlparse, urlunparse
+
+from lxml import etree, html
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4')
+
+_HEADING_XPATH = ' | '.join(f'self::{tag}' for tag in HEADING_TAGS)
+_ANCESTOR_HEADING = etree.XPath(f'ancestor::*[{_HEADING_XPATH}][1]')
+_DESCENDANT_HEADING = etree.XPath(f'.//*[{_HEADING_XPATH}][1]')
+
+# Calidad del título según de dónde sale; gana el mejor entre todos los enlaces al artículo
+TITLE_OWN_HEADING = 3  # Encabezado que contiene el enlace o está dentro de él
+TITLE_CARD_HEADING = 2  # Encabezado de la tarjeta del artículo
+TITLE_ANCHOR_TEXT = 1  # Texto del propio enlace ("Leer más" en algunas tarjetas)
+
+_SPACES_RE = re.compile(r'\s+')
+
+
+def _text(element) -> str:
+    return _SPACES_RE.sub(' ', element.text_content()).strip()
+
+
+def _card(anchor, links_below: dict):
+    """
+    Tarjeta del enlace: el ancestro más alto que solo contiene enlaces a este artículo
+
+    Returns:
+        El elemento de la tarjeta o None si el padre ya contiene otros artículos
+    """
+    card = None
+    element = anchor.getparent()
+    while element is not None and len(links_below.get(element, ())) == 1:
+        card = element
+        element = element.getparent()
+    return card
+
+
+def _title(anchor, links_below: dict) -> tuple:
+    """
+    Título del enlace y su calidad
+
+    Se prefiere el encabezado del propio enlace, después el de su tarjeta y por último
+    el texto del enlace; nunca se mira fuera de la tarjeta para no tomar el título de
+    otro artículo.
+    """
+    headings = _ANCESTOR_HEADING(anchor) or _DESCENDANT_HEADING(anchor)
+    if headings:
+        title = _text(headings[0])
+        if title:
+            return title, TITLE_OWN_HEADING
+
+    card = _card(anchor, links_below)
+    if card is not None:
+        headings = _DESCENDANT_HEADING(card)
+        if headings:
+            title = _text(headings[0])
+            if title:
+                return title, TITLE_CARD_HEADING
+
+    title = _text(anchor)
+    if title:
+        return title, TITLE_ANCHOR_TEXT
+    return '', 0
+
+
+def canonical_link(link: str) -> str:
+    """Enlace sin query ni fragmento y con el host en minúsculas, para deduplicar"""
+    parsed = urlparse(link)
+    return urlunparse((parsed.scheme, parsed.netloc.lower(), parsed.path, '', '', ''))
+
+
+def extract_article_links(content: bytes, page_url: str, profile) -> list:
+    """
+    Extrae los enlaces a artículos de una página de listado recorriendo los <a> una sola vez
+
+    Args:
+        content: HTML de la página
+        page_url: URL de la página, para resolver enlaces relativos
+        profile: SiteProfile del sitio; descarta enlaces a otros dominios y a rutas
+            que no cumplen su article_url_pattern
+
+    Returns:
+        Lista de diccionarios con 'link' y 'title', sin URLs repetidas. Los enlaces se
+        devuelven sin query (parámetros de seguimiento como utm_*)
+    """
+    if not content:
+        return []
+    try:
+        tree = html.fromstring(content)
+    except etree.ParserError:
+        return []
+
+    anchors = []
+    for anchor in tree.iter('a'):
+        href = anchor.get('href')
+        if not href:
+            continue
+        link = canonical_link(urljoin(page_url, href.strip()))
+        parsed = urlparse(link)
+        if profile.matches(parsed.netloc) and profile.article_url_re.match(parsed.path):
+            anchors.append((anchor, link))
+
+    # Artículos distintos enlazados bajo cada elemento, para delimitar las tarjetas.
+    # Basta con saber si hay uno o varios, así que se deja de subir al llegar a dos.
+    links_below = {}
+    for anchor, link in anchors:
+        element = anchor.getparent()
+        while element is not None:
+            links = links_below.setdefault(element, set())
+            if link in links or len(links) > 1:
+                break
+            links.add(link)
+            element = element.getparent()
+
+    # Un mismo artículo suele enlazarse desde la imagen y desde el titular
+    articles = {}
+    for anchor, link in anchors:
+        entry = articles.get(link)
+        if entry and entry['_quality'] == TITLE_OWN_HEADING:
+            continue
+        title, quality = _title(anchor, links_below)
+        if not entry:
+            articles[link] = {'title': title, 'link': link, '_quality': quality}
+        elif quality > entry['_quality']:
+            entry['title'], entry['_quality'] = title, quality
+
+    return [{'title': entry['title'], 'link': entry['link']} for entry in articles.values()]
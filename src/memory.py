@@ -0,0 +1,201 @@
+"""
+Perfilado de memoria y reciclado de workers para crawls de larga duración
+"""
+
+import logging
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Raíz del proyecto: los informes atribuyen la memoria a ficheros bajo este directorio
+_THIS_FILE = os.path.abspath(__file__)
+PROJECT_DIR = os.path.dirname(os.path.dirname(_THIS_FILE))
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Memoria residente actual del proceso en MB
+
+    Returns:
+        RSS en MB o None si no se puede medir en esta plataforma
+    """
+    try:
+        # Linux: segundo campo de /proc/self/statm en páginas
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Sin /proc solo tenemos el pico de memoria (KB en Linux, bytes en macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class MemoryProfiler:
+    """
+    Registra snapshots de tracemalloc y la memoria asignada por cada etapa
+
+    Las etapas se miden con el context manager stage(); el informe final compara
+    el primer y el último snapshot para mostrar los puntos que más memoria retienen.
+    """
+
+    def __init__(self, frames: int = 25, snapshot_every: int = 50):
+        """
+        Args:
+            frames: Número de frames guardados por asignación; deben bastar para
+                llegar desde bs4 o lxml hasta la línea del scraper que las llamó
+            snapshot_every: Páginas entre snapshots automáticos
+        """
+        self.frames = frames
+        self.snapshot_every = snapshot_every
+        self.stages = {}
+        self.snapshots = []
+        self.pages = 0
+        self._started_here = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+        self.take_snapshot()
+
+    def stop(self):
+        self.take_snapshot()
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    def take_snapshot(self):
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ))
+            # Solo guardamos el primero y el último para no acumular memoria
+            self.snapshots = self.snapshots[:1] + [snapshot]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mide la memoria que una etapa deja asignada y su pico"""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            stats = self.stages.setdefault(name, {'calls': 0, 'delta': 0, 'peak': 0})
+            stats['calls'] += 1
+            stats['delta'] += after - before
+            stats['peak'] = max(stats['peak'], peak - before)
+
+    def page_done(self):
+        """Marca una página como procesada y toma un snapshot periódicamente"""
+        self.pages += 1
+        if self.snapshot_every and self.pages % self.snapshot_every == 0:
+            self.take_snapshot()
+
+    @staticmethod
+    def _project_frame(traceback):
+        """Frame más reciente que pertenece al código del proyecto (no a librerías)"""
+        for frame in reversed(traceback):
+            # Módulos congelados e intérprete ('<frozen abc>', '<string>'): no son ficheros
+            if frame.filename.startswith('<'):
+                continue
+            filename = os.path.abspath(frame.filename)
+            if (filename.startswith(PROJECT_DIR + os.sep) and filename != _THIS_FILE
+                    and 'site-packages' not in filename):
+                return frame
+        return None
+
+    def top_allocations(self, limit: int = 10) -> list:
+        """
+        Puntos del código del proyecto cuya memoria retenida más ha crecido entre snapshots
+
+        Las asignaciones se agrupan por traceback completo y se atribuyen a la línea
+        del proyecto más cercana, de modo que la memoria que reserva una librería
+        (re, bs4, lxml...) aparece en la línea del scraper que la llamó.
+
+        Returns:
+            Lista de tuplas ((fichero, línea), diferencia de bytes, diferencia de bloques)
+        """
+        if len(self.snapshots) < 2:
+            return []
+        first, last = self.snapshots[0], self.snapshots[-1]
+        totals = {}
+        for stat in last.compare_to(first, 'traceback'):
+            frame = self._project_frame(stat.traceback)
+            if frame is None:
+                continue
+            key = (os.path.abspath(frame.filename), frame.lineno)
+            size, count = totals.get(key, (0, 0))
+            totals[key] = (size + stat.size_diff, count + stat.count_diff)
+        ranked = sorted(totals.items(), key=lambda item: abs(item[1][0]), reverse=True)
+        return [(key, size, count) for key, (size, count) in ranked[:limit]]
+
+    def report(self, limit: int = 10) -> str:
+        """Informe de texto con las etapas y los principales puntos de asignación"""
+        lines = [f"Páginas procesadas: {self.pages}"]
+        rss = current_rss_mb()
+        if rss is not None:
+            lines.append(f"RSS actual: {rss:.1f} MB")
+
+        lines.append("")
+        lines.append("Memoria por etapa (retenida / pico):")
+        for name, stats in self.stages.items():
+            lines.append(
+                f"  {name:10} {stats['calls']:>6} llamadas  "
+                f"{stats['delta'] / 1024:>10.1f} KB  {stats['peak'] / 1024:>10.1f} KB"
+            )
+
+        lines.append("")
+        lines.append(f"Top {limit} puntos de asignación del proyecto:")
+        for (filename, lineno), size, count in self.top_allocations(limit):
+            lines.append(
+                f"  {os.path.relpath(filename, PROJECT_DIR)}:{lineno}  "
+                f"{size / 1024:+.1f} KB ({count:+d} bloques)"
+            )
+        return '\n'.join(lines)
+
+
+class RecyclePolicy:
+    """Decide cuándo un worker debe terminar para que se reinicie con memoria limpia"""
+
+    def __init__(self, max_pages: int = 0, max_rss_mb: float = 0):
+        """
+        Args:
+            max_pages: Reciclar tras este número de páginas (0 desactiva el límite)
+            max_rss_mb: Reciclar cuando la memoria residente supere estos MB (0 lo desactiva)
+        """
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.pages = 0
+        self.reason = ''
+
+    def page_done(self) -> bool:
+        """
+        Cuenta una página procesada
+
+        Returns:
+            True si el worker debe reciclarse
+        """
+        self.pages += 1
+        if self.max_pages and self.pages >= self.max_pages:
+            self.reason = f"{self.pages} páginas procesadas"
+        elif self.max_rss_mb:
+            rss = current_rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                self.reason = f"RSS de {rss:.1f} MB"
+        if self.reason:
+            logger.info(f"Reciclando worker: {self.reason}")
+        return bool(self.reason)
@@ -2,26 +2,146 @@
 Scraper principal para theobjetive.com
 """
 
+import gc
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from bs4 import BeautifulSoup
 import time
 import logging
 from urllib.parse import urlparse, urljoin
 from datetime import datetime
 import re
+import socket
+import threading
+from contextlib import nullcontext
+
+from .site_profiles import SiteProfile, load_profiles, find_profile
+from .limits import ResourceLimits, CpuBudget, BudgetExceeded, truncate_markup
+from .dates import DateNormalizer
+from .listing import extract_article_links
+from .memory import MemoryProfiler
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tamaño de bloque al leer respuestas: pequeño para comprobar los límites a menudo
+READ_CHUNK_SIZE = 8 * 1024
+
+# Segundos que se espera al hilo de descarga después de cortar su conexión
+ABORT_JOIN_TIMEOUT = 2.0
+
+# Descarga en curso en cada hilo, para que la conexión registre su socket al usarse
+_current_download = threading.local()
+
+
+def _shutdown_socket(sock):
+    """
+    Corta un socket que otro hilo puede estar leyendo
+
+    Cerrar la respuesta desde otro hilo se bloquea hasta que termina la lectura en
+    curso; hacer shutdown del socket hace que esa lectura termine de inmediato.
+    """
+    try:
+        # Duplicamos el descriptor: shutdown afecta a la conexión compartida
+        dup = socket.fromfd(sock.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+    except (OSError, ValueError, AttributeError):
+        return
+    try:
+        dup.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        dup.close()
+
+
+class _RegisterSocketMixin:
+    """Registra el socket de la conexión en la descarga del hilo actual"""
+
+    def _register_socket(self):
+        download = getattr(_current_download, 'value', None)
+        if download is None or self.sock is None:
+            return
+        state, cancelled = download
+        state['socket'] = self.sock
+        # El total_timeout pudo vencer mientras se establecía la conexión
+        if cancelled.is_set():
+            _shutdown_socket(self.sock)
+
+    def connect(self):
+        super().connect()
+        self._register_socket()
+
+    def request(self, *args, **kwargs):
+        # Las conexiones reutilizadas del pool no pasan por connect()
+        super().request(*args, **kwargs)
+        self._register_socket()
+
+
+class _AbortableHTTPConnection(_RegisterSocketMixin, HTTPConnection):
+    pass
+
+
+class _AbortableHTTPSConnection(_RegisterSocketMixin, HTTPSConnection):
+    pass
+
+
+class _AbortableHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _AbortableHTTPConnection
+
+
+class _AbortableHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _AbortableHTTPSConnection
+
+
+class AbortableHTTPAdapter(HTTPAdapter):
+    """
+    Adaptador cuyas conexiones exponen su socket a la descarga que las usa
+
+    Así el total_timeout puede cortar la conexión en cualquier fase: esperando
+    cabeceras, leyendo el cuerpo o justo después de conectar.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _AbortableHTTPConnectionPool,
+            'https': _AbortableHTTPSConnectionPool,
+        }
+
 
 class DittoScraper:
     """Scraper para extraer información de theobjetive.com"""
     
-    def __init__(self):
-        self.base_url = "https://theobjective.com"
-        self.allowed_domain = "theobjective.com"
+    def __init__(self, profiles=None, limits: ResourceLimits = None, profiler: MemoryProfiler = None,
+                 gc_every: int = 20):
+        """
+        Args:
+            profiles: Lista de SiteProfile o ruta a un fichero/directorio de perfiles.
+                Si es None, se cargan los perfiles incluidos en el proyecto
+            limits: Límites de recursos por página. Si es None, se usan los valores por defecto
+            profiler: Si se indica, mide la memoria de cada etapa de la extracción
+            gc_every: Artículos entre recolecciones de basura explícitas (0 las desactiva)
+        """
+        self.limits = limits or ResourceLimits()
+        self.profiler = profiler
+        self.gc_every = gc_every
+        self._pages_since_gc = 0
+        self.date_normalizer = DateNormalizer()
+        if profiles is None or isinstance(profiles, (str, bytes)) or hasattr(profiles, '__fspath__'):
+            profiles = load_profiles(profiles)
+        if not profiles:
+            raise ValueError("Se necesita al menos un perfil de sitio")
+        self.profiles = list(profiles)
+        # El primer perfil define el sitio por defecto
+        self.base_url = self.profiles[0].base_url
+        self.allowed_domain = self.profiles[0].domain
         self.session = requests.Session()
+        adapter = AbortableHTTPAdapter()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         # Headers para simular un navegador real
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -46,13 +166,23 @@ class DittoScraper:
         
         parsed_url = urlparse(url)
         
-        # Verificar que el dominio sea theobjective.com o un subdominio
-        if not (parsed_url.netloc == self.allowed_domain or 
-                parsed_url.netloc.endswith(f'.{self.allowed_domain}')):
-            raise ValueError(f"URL no permitida. Debe pertenecer al dominio {self.allowed_domain}. URL recibida: {url}")
+        # Verificar que el dominio pertenezca a alguno de los perfiles configurados
+        if not find_profile(self.profiles, parsed_url.netloc):
+            domains = ', '.join(profile.domain for profile in self.profiles)
+            raise ValueError(f"URL no permitida. Debe pertenecer al dominio {domains}. URL recibida: {url}")
         
         return url
     
+    def _get_profile(self, url: str) -> SiteProfile:
+        """
+        Obtiene el perfil de sitio que corresponde a la URL
+        
+        Raises:
+            ValueError: Si la URL no pertenece a ningún perfil configurado
+        """
+        validated_url = self._validate_url(url)
+        return find_profile(self.profiles, urlparse(validated_url).netloc)
+    
     def get_page(self, url: str) -> BeautifulSoup:
         """
         Obtiene el contenido de una página web
@@ -67,16 +197,77 @@ class DittoScraper:
             ValueError: Si la URL no pertenece al dominio permitido
             requests.RequestException: Si hay errores en la petición HTTP
         """
+        soup, _ = self._fetch(url)
+        return soup
+    
+    def _fetch(self, url: str) -> tuple:
+        """
+        Descarga y parsea una página respetando los límites de recursos
+        
+        Returns:
+            Tupla (BeautifulSoup, lista de límites superados)
+        """
+        content, violations = self._download(url)
+        soup = BeautifulSoup(content, 'html.parser')
+        return soup, violations
+    
+    def _download(self, url: str) -> tuple:
+        """
+        Descarga el HTML de una página respetando los límites de recursos
+        
+        Returns:
+            Tupla (contenido en bytes, lista de límites superados)
+        """
+        violations = []
         try:
             # Validar la URL antes de hacer la petición
             validated_url = self._validate_url(url)
             
             logger.info(f"Scrapeando: {validated_url}")
-            response = self.session.get(validated_url)
-            response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return soup
+            # La descarga corre en un hilo aparte para poder cortarla al llegar al
+            # total_timeout, también durante la espera de cabeceras o si el servidor
+            # envía los datos muy despacio sin llegar a superar el read_timeout
+            chunks = []
+            read_violations = []
+            state = {}
+            finished = threading.Event()
+            cancelled = threading.Event()
+            worker = threading.Thread(
+                target=self._read_response,
+                args=(validated_url, chunks, read_violations, state, finished, cancelled),
+                daemon=True
+            )
+            worker.start()
+            
+            if not finished.wait(self.limits.total_timeout):
+                cancelled.set()
+                violations.append('total_timeout')
+                sock = state.get('socket')
+                if sock is not None:
+                    _shutdown_socket(sock)
+                # Con el socket cortado el hilo termina enseguida; esperarlo evita
+                # que siga usando la sesión durante la siguiente petición
+                worker.join(ABORT_JOIN_TIMEOUT)
+                if worker.is_alive():
+                    logger.warning(f"La descarga de {validated_url} sigue activa tras cancelarla")
+                if not chunks:
+                    raise requests.Timeout(
+                        f"Se superó el tiempo total de {self.limits.total_timeout}s sin recibir contenido"
+                    )
+            elif 'error' in state:
+                raise state['error']
+            else:
+                violations.extend(read_violations)
+            
+            content = b''.join(list(chunks))[:self.limits.max_response_bytes]
+            content, truncated = truncate_markup(content, self.limits.max_dom_nodes)
+            if truncated:
+                violations.append('max_dom_nodes')
+            if violations:
+                logger.warning(f"Límites superados en {validated_url}: {', '.join(violations)}. Se usa contenido parcial")
+            
+            return content, violations
             
         except ValueError as e:
             logger.error(f"Error de validación de URL: {e}")
@@ -85,6 +276,36 @@ class DittoScraper:
             logger.error(f"Error al acceder a {url}: {e}")
             raise
     
+    def _read_response(self, url: str, chunks: list, violations: list, state: dict,
+                       finished: threading.Event, cancelled: threading.Event):
+        """Descarga la respuesta por bloques pequeños hasta terminar, superar el tamaño o ser cancelada"""
+        _current_download.value = (state, cancelled)
+        try:
+            response = self.session.get(url, timeout=self.limits.timeout, stream=True)
+            try:
+                response.raise_for_status()
+                
+                size = 0
+                for chunk in response.iter_content(chunk_size=READ_CHUNK_SIZE):
+                    if cancelled.is_set():
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > self.limits.max_response_bytes:
+                        violations.append('max_response_bytes')
+                        break
+            finally:
+                response.close()
+        except Exception as e:
+            state['error'] = e
+        finally:
+            _current_download.value = None
+            finished.set()
+    
+    def _stage(self, name: str):
+        """Context manager que mide la etapa si el perfilado de memoria está activo"""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+    
     def _clean_text(self, text: str) -> str:
         """Limpia y normaliza texto extraído"""
         if not text:
@@ -104,8 +325,9 @@ class DittoScraper:
             {'name': 'time', 'attrs': {'datetime': True}},
             {'name': 'time', 'attrs': {}},
             # Class patterns
+            # bs4 llama al filtro de 'class' con cada clase por separado
             {'name': ['div', 'span', 'p'], 'attrs': {'class': lambda x: x and any(
-                keyword in ' '.join(x).lower() for keyword in ['date', 'time', 'published', 'fecha']
+                keyword in x.lower() for keyword in ['date', 'time', 'published', 'fecha']
             )}}
         ]
         
@@ -134,117 +356,114 @@ class DittoScraper:
         Returns:
             Diccionario con el contenido del artículo
         """
-        soup = self.get_page(url)
+        profile = self._get_profile(url)
+        with self._stage('fetch'):
+            content, violations = self._download(url)
+        # El presupuesto incluye el parseo, que suele ser la etapa más cara
+        budget = CpuBudget(self.limits.cpu_time_budget)
+        with self._stage('parse'):
+            soup = BeautifulSoup(content, 'html.parser')
+            del content
+        
+        try:
+            with self._stage('extract'):
+                return self._extract_article(soup, url, profile, violations, budget)
+        finally:
+            with self._stage('release'):
+                soup.decompose()
+                self._collect_garbage()
+            if self.profiler:
+                self.profiler.page_done()
+    
+    def _collect_garbage(self):
+        """
+        Recolecta la basura cada gc_every artículos
+        
+        decompose() deja ciclos de referencias entre los nodos del árbol, así que su
+        memoria no se devuelve hasta que pasa el GC; forzarlo de vez en cuando evita
+        que se acumulen los árboles de muchas páginas.
+        """
+        self._pages_since_gc += 1
+        if self.gc_every and self._pages_since_gc >= self.gc_every:
+            gc.collect()
+            self._pages_since_gc = 0
+    
+    def _extract_article(self, soup: BeautifulSoup, url: str, profile: SiteProfile,
+                         violations: list, budget: CpuBudget) -> dict:
+        """Extrae los campos del artículo de una página ya parseada"""
         article_data = {
             'url': url,
             'title': '',
             'subtitle': '',
             'author': '',
             'date': '',
+            'published_at': '',
             'content': '',
             'tags': [],
-            'category': ''
+            'category': '',
+            'budget_violations': violations
         }
+        content_text = []
+        tags = []
         
         try:
-            # Extraer título
-            title_selectors = [
-                'h1',
-                '[class*="title"]',
-                '[class*="headline"]',
-                '.entry-title',
-                'article h1'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    article_data['title'] = self._clean_text(title_elem.get_text())
-                    break
-            
-            # Extraer subtítulo
-            subtitle_selectors = [
-                '[class*="subtitle"]',
-                '[class*="summary"]',
-                '[class*="excerpt"]',
-                '.entry-summary'
-            ]
-            
-            for selector in subtitle_selectors:
-                subtitle_elem = soup.select_one(selector)
-                if subtitle_elem:
-                    article_data['subtitle'] = self._clean_text(subtitle_elem.get_text())
-                    break
+            # Extraer categoría desde la URL o breadcrumbs
+            url_parts = url.split('/')
+            if len(url_parts) > 3:
+                potential_category = url_parts[3]
+                if potential_category != 'www':
+                    article_data['category'] = potential_category
             
-            # Extraer autor
-            author_selectors = [
-                '[class*="author"]',
-                '[class*="byline"]',
-                '[rel="author"]',
-                '.entry-author'
-            ]
+            budget.check('parse')
             
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
-                if author_elem:
-                    article_data['author'] = self._clean_text(author_elem.get_text())
-                    break
+            # Extraer título, subtítulo y autor con los selectores del perfil
+            for field in ('title', 'subtitle', 'author'):
+                elem = profile.select_one(field, soup)
+                if elem:
+                    article_data[field] = self._clean_text(elem.get_text())
+            budget.check('metadata')
             
             # Extraer fecha
             article_data['date'] = self._extract_date(soup)
+            published_at = self.date_normalizer.normalize(article_data['date'], url)
+            if published_at:
+                article_data['published_at'] = published_at.isoformat()
+            budget.check('date')
             
             # Extraer contenido principal
-            content_selectors = [
-                'article',
-                '[class*="content"]',
-                '[class*="article-body"]',
-                '[class*="entry-content"]',
-                '.post-content',
-                'main'
-            ]
-            
-            content_text = []
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Buscar párrafos dentro del contenido
-                    paragraphs = content_elem.find_all('p')
-                    for p in paragraphs:
-                        p_text = self._clean_text(p.get_text())
-                        if len(p_text) > 20:  # Filtrar párrafos muy cortos
-                            content_text.append(p_text)
-                    
-                    if content_text:
-                        break
+            for content_elem in profile.iter_select_one('content', soup):
+                # Buscar párrafos dentro del contenido
+                paragraphs = content_elem.find_all('p')
+                for p in paragraphs:
+                    p_text = self._clean_text(p.get_text())
+                    if len(p_text) > 20:  # Filtrar párrafos muy cortos
+                        content_text.append(p_text)
+                    budget.check('content')
+                
+                if content_text:
+                    break
             
             article_data['content'] = '\n\n'.join(content_text)
             
             # Extraer tags/etiquetas
-            tag_selectors = [
-                '[class*="tag"]',
-                '[class*="label"]',
-                '[class*="category"]'
-            ]
-            
-            tags = []
-            for selector in tag_selectors:
-                tag_elems = soup.select(selector)
-                for tag_elem in tag_elems:
-                    tag_text = self._clean_text(tag_elem.get_text())
-                    if tag_text and tag_text not in tags:
-                        tags.append(tag_text)
+            for tag_elem in profile.select('tags', soup):
+                tag_text = self._clean_text(tag_elem.get_text())
+                if tag_text and tag_text not in tags:
+                    tags.append(tag_text)
+                if len(tags) >= 10:  # Limitar a 10 tags
+                    break
+                budget.check('tags')
             
-            article_data['tags'] = tags[:10]  # Limitar a 10 tags
-            
-            # Extraer categoría desde la URL o breadcrumbs
-            url_parts = url.split('/')
-            if len(url_parts) > 3:
-                potential_category = url_parts[3]
-                if potential_category != 'www':
-                    article_data['category'] = potential_category
+            article_data['tags'] = tags
             
             logger.info(f"Artículo extraído exitosamente: {article_data['title'][:50]}...")
             
+        except BudgetExceeded as e:
+            # Devolver lo extraído hasta agotar el presupuesto
+            article_data['content'] = '\n\n'.join(content_text)
+            article_data['tags'] = tags
+            violations.append('cpu_time_budget')
+            logger.warning(f"Presupuesto de CPU agotado en la etapa '{e}' tras {budget.elapsed:.2f}s. Se devuelve resultado parcial")
         except Exception as e:
             logger.error(f"Error extrayendo contenido del artículo: {e}")
             
@@ -261,39 +480,17 @@ class DittoScraper:
             Lista de diccionarios con información de los artículos
         """
         target_url = url if url else self.base_url
-        soup = self.get_page(target_url)
+        profile = self._get_profile(target_url)
+        content, _ = self._download(target_url)
         articles = []
         
-        # Ejemplo básico: buscar elementos que podrían ser artículos
         try:
-            # Buscar posibles contenedores de artículos
-            potential_articles = soup.find_all(['article', 'div'], class_=lambda x: x and any(
-                keyword in x.lower() for keyword in ['article', 'post', 'news', 'story', 'content']
-            ))
-            
-            for article_elem in potential_articles:
-                article_data = {}
-                
-                # Intentar extraer título
-                title_elem = article_elem.find(['h1', 'h2', 'h3', 'h4'], class_=lambda x: x and any(
-                    keyword in x.lower() for keyword in ['title', 'heading', 'headline']
-                ))
-                if title_elem:
-                    article_data['title'] = title_elem.get_text(strip=True)
-                
-                # Intentar extraer enlace
-                link_elem = article_elem.find('a', href=True)
-                if link_elem:
-                    article_data['link'] = urljoin(target_url, link_elem['href'])
-                
-                # Solo agregar si tiene al menos título o enlace
-                if article_data.get('title') or article_data.get('link'):
-                    articles.append(article_data)
-            
-            logger.info(f"Extracción básica completada. Elementos potenciales encontrados: {len(articles)}")
+            # Recorrer los enlaces una sola vez y quedarse con los que son rutas de artículo
+            articles = extract_article_links(content, self._validate_url(target_url), profile)
+            logger.info(f"Extracción de listado completada. Artículos encontrados: {len(articles)}")
             
         except Exception as e:
-            logger.warning(f"Error durante la extracción básica: {e}")
+            logger.warning(f"Error durante la extracción del listado: {e}")
         
         return articles
     
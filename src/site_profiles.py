@@ -0,0 +1,152 @@
+"""
+Perfiles de sitio con reglas de extracción configurables
+"""
+
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+logger = logging.getLogger(__name__)
+
+# Directorio con los perfiles incluidos en el proyecto
+DEFAULT_PROFILES_DIR = Path(__file__).parent / 'profiles'
+
+# Campos que un perfil puede declarar en su sección [selectors]
+PROFILE_FIELDS = ('title', 'subtitle', 'author', 'content', 'tags')
+
+# Ruta de los artículos: /seccion[/subseccion]/YYYY-MM-DD/slug/
+DEFAULT_ARTICLE_URL_PATTERN = r'^/(?:[\w-]+/)+\d{4}-\d{2}-\d{2}/[\w-]+/?$'
+
+
+class SiteProfile:
+    """Reglas de extracción de un sitio con los selectores precompilados"""
+
+    def __init__(self, name: str, domain: str, base_url: str = None, selectors: dict = None,
+                 article_url_pattern: str = DEFAULT_ARTICLE_URL_PATTERN):
+        self.name = name
+        self.domain = domain.lower()
+        self.base_url = base_url or f"https://{self.domain}"
+        # Patrón que deben cumplir las rutas de artículo en las páginas de listado
+        self.article_url_re = re.compile(article_url_pattern)
+        # Compilamos cada selector una sola vez al cargar el perfil
+        self.selectors = {}
+        for field in PROFILE_FIELDS:
+            patterns = (selectors or {}).get(field, [])
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            self.selectors[field] = [sv.compile(pattern) for pattern in patterns]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SiteProfile':
+        """
+        Crea un perfil a partir de un diccionario ya parseado
+
+        Raises:
+            ValueError: Si falta el dominio del perfil
+        """
+        if not data.get('domain'):
+            raise ValueError("El perfil de sitio debe declarar un 'domain'")
+        return cls(
+            name=data.get('name', data['domain']),
+            domain=data['domain'],
+            base_url=data.get('base_url'),
+            selectors=data.get('selectors', {}),
+            article_url_pattern=data.get('article_url_pattern', DEFAULT_ARTICLE_URL_PATTERN)
+        )
+
+    def matches(self, host: str) -> bool:
+        """Indica si el host pertenece al dominio del perfil o a un subdominio"""
+        host = host.lower()
+        return host == self.domain or host.endswith(f'.{self.domain}')
+
+    def select_one(self, field: str, soup: BeautifulSoup):
+        """Devuelve el primer elemento que coincide, probando los selectores en orden"""
+        for selector in self.selectors.get(field, []):
+            elem = selector.select_one(soup)
+            if elem:
+                return elem
+        return None
+
+    def iter_select_one(self, field: str, soup: BeautifulSoup) -> Iterator:
+        """Devuelve el primer elemento de cada selector del campo, en orden de fallback"""
+        for selector in self.selectors.get(field, []):
+            elem = selector.select_one(soup)
+            if elem:
+                yield elem
+
+    def select(self, field: str, soup: BeautifulSoup) -> Iterator:
+        """Devuelve todos los elementos que coinciden con cualquier selector del campo"""
+        for selector in self.selectors.get(field, []):
+            yield from selector.select(soup)
+
+    def __repr__(self) -> str:
+        return f"SiteProfile(name={self.name!r}, domain={self.domain!r})"
+
+
+def _read_profile_file(path: Path) -> dict:
+    """Lee un fichero de perfil en formato TOML o YAML"""
+    suffix = path.suffix.lower()
+    if suffix == '.toml':
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    if suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("Se necesita PyYAML para cargar perfiles YAML: pip install pyyaml") from e
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    raise ValueError(f"Formato de perfil no soportado: {path}")
+
+
+def load_profiles(path=None) -> List[SiteProfile]:
+    """
+    Carga perfiles de sitio desde un fichero o un directorio
+
+    Cada ruta se lee y compila una sola vez por proceso, de modo que crear varios
+    scrapers (por ejemplo uno por petición en la app) no vuelve a parsear selectores.
+
+    Args:
+        path: Fichero .toml/.yaml o directorio con perfiles. Si es None, usa los incluidos
+
+    Returns:
+        Lista de perfiles con los selectores ya compilados
+    """
+    path = Path(path).resolve() if path else DEFAULT_PROFILES_DIR
+    return list(_load_profiles_cached(path))
+
+
+@lru_cache(maxsize=None)
+def _load_profiles_cached(path: Path) -> tuple:
+    if path.is_dir():
+        files = sorted(
+            p for p in path.iterdir()
+            if p.suffix.lower() in ('.toml', '.yaml', '.yml')
+        )
+    else:
+        files = [path]
+
+    profiles = []
+    for file in files:
+        profile = SiteProfile.from_dict(_read_profile_file(file))
+        logger.info(f"Perfil cargado: {profile.name} ({profile.domain})")
+        profiles.append(profile)
+    return tuple(profiles)
+
+
+def find_profile(profiles: List[SiteProfile], host: str) -> Optional[SiteProfile]:
+    """Devuelve el perfil que corresponde al host o None si ninguno coincide"""
+    for profile in profiles:
+        if profile.matches(host):
+            return profile
+    return None
@@ -0,0 +1,270 @@
+"""
+Cola de trabajo compartida para el modo de crawl distribuido
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from .memory import RecyclePolicy
+
+logger = logging.getLogger(__name__)
+
+
+class Lease:
+    """Reserva temporal de una URL por parte de un worker"""
+
+    def __init__(self, url: str, token: str, attempts: int):
+        self.url = url
+        self.token = token
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"Lease(url={self.url!r}, attempts={self.attempts})"
+
+
+class WorkQueue(ABC):
+    """
+    Interfaz común de las colas de trabajo
+
+    Las implementaciones deben garantizar que una URL solo está reservada por un
+    worker a la vez y que las reservas caducadas vuelven a estar disponibles.
+    """
+
+    @abstractmethod
+    def push(self, url: str) -> bool:
+        """Encola una URL. Devuelve False si ya estaba en la cola"""
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float = 300) -> Optional[Lease]:
+        """Reserva la siguiente URL disponible o devuelve None si no hay trabajo"""
+
+    @abstractmethod
+    def ack(self, lease: Lease, result: dict) -> bool:
+        """Guarda el resultado y marca la URL como terminada"""
+
+    @abstractmethod
+    def nack(self, lease: Lease, error: str = '') -> None:
+        """Libera la reserva tras un error para que la URL se reintente"""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Devuelve el número de URLs por estado"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Cola de trabajo respaldada por un fichero SQLite
+
+    Varios procesos de la misma máquina pueden compartir el fichero. Cada reserva se
+    hace dentro de una transacción IMMEDIATE, así que dos workers nunca obtienen la
+    misma URL. El modo WAL usa memoria compartida, por lo que el fichero no puede
+    estar en un sistema de ficheros de red.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                url TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                token TEXT,
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, lease_until);
+            CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                finished_at REAL NOT NULL
+            );
+        ''')
+
+    def close(self):
+        self._conn.close()
+
+    def push(self, url: str) -> bool:
+        cursor = self._conn.execute(
+            'INSERT OR IGNORE INTO tasks (url, created_at) VALUES (?, ?)',
+            (url, time.time())
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, worker_id: str, lease_seconds: float = 300) -> Optional[Lease]:
+        now = time.time()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Las reservas que caducaron demasiadas veces se descartan: el worker
+            # probablemente cae con esas URLs
+            cursor = self._conn.execute(
+                """UPDATE tasks SET status = 'failed', token = NULL
+                   WHERE attempts >= ?
+                     AND (status = 'pending' OR (status = 'leased' AND lease_until < ?))""",
+                (self.max_attempts, now)
+            )
+            if cursor.rowcount:
+                logger.warning(f"{cursor.rowcount} URLs descartadas tras {self.max_attempts} intentos")
+
+            row = self._conn.execute(
+                """SELECT url, attempts FROM tasks
+                   WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?)
+                   ORDER BY created_at LIMIT 1""",
+                (now,)
+            ).fetchone()
+            if not row:
+                self._conn.execute('COMMIT')
+                return None
+
+            url, attempts = row
+            token = uuid.uuid4().hex
+            self._conn.execute(
+                """UPDATE tasks SET status = 'leased', token = ?, worker = ?,
+                   lease_until = ?, attempts = attempts + 1 WHERE url = ?""",
+                (token, worker_id, now + lease_seconds, url)
+            )
+            self._conn.execute('COMMIT')
+            return Lease(url, token, attempts + 1)
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def ack(self, lease: Lease, result: dict) -> bool:
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'done', token = NULL, error = NULL "
+                "WHERE url = ? AND token = ?",
+                (lease.url, lease.token)
+            )
+            if cursor.rowcount == 0:
+                # Otro worker tomó la URL al caducar nuestra reserva
+                self._conn.execute('ROLLBACK')
+                logger.warning(f"Reserva perdida, se descarta el resultado de: {lease.url}")
+                return False
+            # Escritura idempotente: un mismo resultado se guarda una sola vez por URL
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (url, data, finished_at) VALUES (?, ?, ?)',
+                (lease.url, json.dumps(result, ensure_ascii=False, default=str), time.time())
+            )
+            self._conn.execute('COMMIT')
+            return True
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def nack(self, lease: Lease, error: str = '') -> None:
+        status = 'failed' if lease.attempts >= self.max_attempts else 'pending'
+        self._conn.execute(
+            '''UPDATE tasks SET status = ?, token = NULL, lease_until = NULL, error = ?
+               WHERE url = ? AND token = ?''',
+            (status, error, lease.url, lease.token)
+        )
+
+    def stats(self) -> dict:
+        now = time.time()
+        stats = {'pending': 0, 'leased': 0, 'expired': 0, 'done': 0, 'failed': 0}
+        rows = self._conn.execute(
+            '''SELECT CASE WHEN status = 'leased' AND lease_until < ? THEN 'expired'
+                      ELSE status END, COUNT(*)
+               FROM tasks GROUP BY 1''',
+            (now,)
+        ).fetchall()
+        for status, count in rows:
+            stats[status] = count
+        return stats
+
+    def results(self) -> list:
+        """Devuelve todos los artículos guardados"""
+        return list(self.iter_results())
+
+    def iter_results(self):
+        """Recorre los artículos guardados sin cargarlos todos en memoria"""
+        for (data,) in self._conn.execute('SELECT data FROM results ORDER BY finished_at'):
+            yield json.loads(data)
+
+
+def default_worker_id() -> str:
+    """Identificador del worker basado en el host y el PID"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def discover(scraper, queue: WorkQueue, url: str = None) -> int:
+    """
+    Descubre artículos en una página de listado y los encola
+
+    Args:
+        scraper: Instancia de DittoScraper
+        queue: Cola de trabajo compartida
+        url: Página de listado. Si es None, usa la página principal
+
+    Returns:
+        Número de URLs nuevas añadidas a la cola
+    """
+    added = 0
+    for article in scraper.scrape_articles(url):
+        link = article.get('link')
+        if link and queue.push(link):
+            added += 1
+    logger.info(f"Descubrimiento completado: {added} URLs nuevas encoladas")
+    return added
+
+
+def run_worker(scraper, queue: WorkQueue, worker_id: str = None,
+               lease_seconds: float = 300, idle_timeout: float = 0,
+               poll_interval: float = 1.0, recycle: RecyclePolicy = None) -> int:
+    """
+    Procesa URLs de la cola hasta que no quede trabajo
+
+    Args:
+        scraper: Instancia de DittoScraper
+        queue: Cola de trabajo compartida
+        worker_id: Identificador del worker. Si es None, se genera a partir del host y PID
+        lease_seconds: Duración de cada reserva antes de que otro worker pueda tomarla
+        idle_timeout: Segundos a esperar por trabajo nuevo antes de terminar
+        poll_interval: Segundos entre consultas cuando la cola está vacía
+        recycle: Si se indica, el worker termina al superar sus límites de páginas o memoria
+
+    Returns:
+        Número de artículos procesados correctamente
+    """
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    idle_since = None
+
+    while True:
+        lease = queue.lease(worker_id, lease_seconds)
+        if not lease:
+            idle_since = idle_since or time.time()
+            if time.time() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+        idle_since = None
+
+        try:
+            article_data = scraper.scrape_article_content(lease.url)
+        except Exception as e:
+            logger.error(f"[{worker_id}] Error procesando {lease.url}: {e}")
+            queue.nack(lease, str(e))
+        else:
+            if queue.ack(lease, article_data):
+                processed += 1
+
+        if recycle and recycle.page_done():
+            break
+
+    logger.info(f"[{worker_id}] Worker terminado. Artículos procesados: {processed}")
+    return processed
@@ -6,6 +6,7 @@ Extrae contenido de artículos de theobjetive.com
 
 import streamlit as st
 from src.scraper import DittoScraper
+from src.memory import current_rss_mb
 import time
 from datetime import datetime
 
@@ -189,6 +190,9 @@ def main():
                     </div>
                     """, unsafe_allow_html=True)
                     
+                    if article_data.get('budget_violations'):
+                        st.warning(f"⚠️ Resultado parcial: se superaron los límites {', '.join(article_data['budget_violations'])}")
+                    
                     # Mostrar información del artículo
                     st.header("📋 Información del Artículo")
                     
@@ -228,6 +232,8 @@ def main():
                     with info_col2:
                         st.markdown("**📅 Fecha:**")
                         st.markdown(article_data['date'] if article_data['date'] else "*No encontrada*")
+                        if article_data.get('published_at'):
+                            st.caption(f"Normalizada: {article_data['published_at']}")
                         
                         st.markdown("**📂 Categoría:**")
                         st.markdown(article_data['category'] if article_data['category'] else "*No encontrada*")
@@ -260,6 +266,9 @@ def main():
                     # Información de debug si está habilitada
                     if show_debug:
                         st.subheader("🔧 Información de Debug")
+                        rss = current_rss_mb()
+                        if rss is not None:
+                            st.caption(f"Memoria residente del proceso: {rss:.1f} MB")
                         st.json(article_data)
                 
                 else:
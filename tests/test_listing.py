@@ -0,0 +1,35 @@
+"""
+Extracción de enlaces a artículos en páginas de listado
+"""
+
+from src.listing import extract_article_links
+from src.site_profiles import SiteProfile
+
+PAGE_URL = 'https://theobjective.com/economia/'
+PROFILE = SiteProfile('theobjective', 'theobjective.com')
+
+
+def test_query_string_does_not_duplicate_articles():
+    html = b'''
+    <section>
+      <article><a href="/a/2025-01-01/x/?utm_source=portada"><img src="x.jpg"></a>
+               <h2><a href="/a/2025-01-01/x/">Titular X</a></h2></article>
+      <article><h2><a href="/a/2025-01-02/y/">Titular Y</a></h2></article>
+    </section>
+    '''
+    articles = extract_article_links(html, PAGE_URL, PROFILE)
+
+    assert articles == [
+        {'title': 'Titular X', 'link': 'https://theobjective.com/a/2025-01-01/x/'},
+        {'title': 'Titular Y', 'link': 'https://theobjective.com/a/2025-01-02/y/'},
+    ]
+
+
+def test_host_is_matched_case_insensitively():
+    html = b'''
+    <h2><a href="HTTPS://THEOBJECTIVE.COM/b/2025-01-02/y/">Titular Y</a></h2>
+    <h2><a href="https://otrodominio.com/b/2025-01-03/z/">Otro sitio</a></h2>
+    '''
+    articles = extract_article_links(html, PAGE_URL, PROFILE)
+
+    assert articles == [{'title': 'Titular Y', 'link': 'https://theobjective.com/b/2025-01-02/y/'}]
@@ -0,0 +1,25 @@
+"""
+Extracción de la fecha de publicación desde elementos con clases de fecha
+"""
+
+import pytest
+
+from src.scraper import DittoScraper
+
+ARTICLE_URL = 'https://theobjective.com/economia/2025-07-12/articulo/'
+
+
+@pytest.fixture
+def scraper():
+    return DittoScraper()
+
+
+@pytest.mark.parametrize('css_class', ['fecha', 'post-date', 'entry-fecha x'])
+def test_fecha_class_keeps_text_time(scraper, monkeypatch, css_class):
+    html = f'<html><body><span class="{css_class}">13 de julio de 2025 10:30</span></body></html>'
+    monkeypatch.setattr(scraper, '_download', lambda url: (html.encode(), []))
+
+    article = scraper.scrape_article_content(ARTICLE_URL)
+
+    assert article['date'] == '13 de julio de 2025 10:30'
+    assert article['published_at'] == '2025-07-13T10:30:00+02:00'